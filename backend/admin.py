@@ -0,0 +1,182 @@
+"""Admin CLI for inspecting and exporting the database.
+
+Rows are streamed from the DB in batches (yield_per) and written out as they
+arrive, so memory use stays flat however large a table is.
+
+  python admin.py tables
+  python admin.py count users
+  python admin.py count published_posts --where platform=twitter --where "created_at>=2026-01-01"
+  python admin.py export users --format csv --output users.csv
+  python admin.py export post_metric_snapshots --where post_id=42 --columns captured_at,likes
+
+Secret columns (tokens, password hashes) are left out of exports unless
+--include-secrets is passed. The DB is taken from DATABASE_URL, as for the app.
+"""
+import argparse
+import csv
+import json
+import re
+import sys
+from datetime import date, datetime
+
+from sqlalchemy import func, inspect, select
+
+from db import Base, SessionLocal, engine
+import models  # noqa: F401 — registers the tables on Base.metadata
+
+SECRET_COLUMNS = {"access_token", "access_token_secret", "hashed_password"}
+
+_WHERE = re.compile(r"^(\w+)\s*(>=|<=|!=|=|>|<)\s*(.*)$")
+_OPS = {
+    "=": lambda c, v: c.is_(None) if v is None else c == v,
+    "!=": lambda c, v: c.isnot(None) if v is None else c != v,
+    ">=": lambda c, v: c >= v,
+    "<=": lambda c, v: c <= v,
+    ">": lambda c, v: c > v,
+    "<": lambda c, v: c < v,
+}
+
+
+def _table(name: str):
+    table = Base.metadata.tables.get(name)
+    if table is None:
+        sys.exit(f"Unknown table '{name}'. Known: {', '.join(sorted(Base.metadata.tables))}")
+    if not inspect(engine).has_table(name):
+        sys.exit(f"Table '{name}' does not exist in the database yet (run `python migrate.py`)")
+    return table
+
+
+def _coerce(column, raw: str):
+    if raw.lower() == "null":
+        return None
+    try:
+        py_type = column.type.python_type
+    except NotImplementedError:
+        return raw
+    if py_type is datetime:
+        return datetime.fromisoformat(raw)
+    if py_type is bool:
+        return raw.lower() in ("1", "true", "yes")
+    return py_type(raw)
+
+
+def _conditions(table, wheres):
+    conditions = []
+    for expr in wheres or []:
+        match = _WHERE.match(expr)
+        if not match:
+            sys.exit(f"Bad --where '{expr}' (expected column<op>value, op in = != >= <= > <)")
+        name, op, raw = match.groups()
+        if name not in table.c:
+            sys.exit(f"Unknown column '{name}' on {table.name}")
+        column = table.c[name]
+        try:
+            value = _coerce(column, raw)
+        except ValueError as e:
+            sys.exit(f"Bad value '{raw}' for {table.name}.{name}: {e}")
+        conditions.append(_OPS[op](column, value))
+    return conditions
+
+
+def _columns(table, args):
+    if args.columns:
+        names = [n.strip() for n in args.columns.split(",") if n.strip()]
+        unknown = [n for n in names if n not in table.c]
+        if unknown:
+            sys.exit(f"Unknown column(s) on {table.name}: {', '.join(unknown)}")
+    else:
+        names = [c.name for c in table.c]
+    if not args.include_secrets:
+        secret = [n for n in names if n in SECRET_COLUMNS]
+        if secret and args.columns:
+            print(f"Leaving out secret column(s) {', '.join(secret)}; pass --include-secrets to export them", file=sys.stderr)
+        names = [n for n in names if n not in SECRET_COLUMNS]
+    if not names:
+        sys.exit(f"No columns to export from {table.name} (secret columns need --include-secrets)")
+    return [table.c[n] for n in names]
+
+
+def _jsonable(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def cmd_tables(args):
+    inspector = inspect(engine)
+    for name in inspector.get_table_names():
+        cols = [c["name"] for c in inspector.get_columns(name)]
+        print(f"Table: {name}")
+        print(f"  Columns: {', '.join(cols)}")
+
+
+def cmd_count(args):
+    table = _table(args.table)
+    query = select(func.count()).select_from(table).where(*_conditions(table, args.where))
+    with SessionLocal() as db:
+        print(db.execute(query).scalar_one())
+
+
+def cmd_export(args):
+    table = _table(args.table)
+    columns = _columns(table, args)
+    order = list(table.primary_key.columns) or columns[:1]
+    query = (
+        select(*columns)
+        .where(*_conditions(table, args.where))
+        .order_by(*order)
+        .execution_options(yield_per=args.batch_size)
+    )
+    if args.limit:
+        query = query.limit(args.limit)
+
+    out = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    names = [c.name for c in columns]
+    written = 0
+    try:
+        if args.format == "csv":
+            writer = csv.writer(out)
+            writer.writerow(names)
+            write = lambda row: writer.writerow([_jsonable(v) for v in row])
+        else:
+            write = lambda row: out.write(json.dumps(dict(zip(names, map(_jsonable, row))), ensure_ascii=False) + "\n")
+
+        with SessionLocal() as db:
+            for partition in db.execute(query).partitions():
+                for row in partition:
+                    write(row)
+                written += len(partition)
+                out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"Exported {written} row(s) from {table.name}", file=sys.stderr)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("tables", help="List tables and their columns").set_defaults(func=cmd_tables)
+
+    count = sub.add_parser("count", help="Count rows, optionally filtered")
+    count.add_argument("table")
+    count.add_argument("--where", action="append", metavar="COL<op>VALUE")
+    count.set_defaults(func=cmd_count)
+
+    export = sub.add_parser("export", help="Stream rows out as JSONL or CSV")
+    export.add_argument("table")
+    export.add_argument("--where", action="append", metavar="COL<op>VALUE")
+    export.add_argument("--columns", help="Comma-separated column list (default: all)")
+    export.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+    export.add_argument("--output", "-o", help="Output file (default: stdout)")
+    export.add_argument("--batch-size", type=int, default=1000)
+    export.add_argument("--limit", type=int)
+    export.add_argument("--include-secrets", action="store_true", help="Include token and password hash columns")
+    export.set_defaults(func=cmd_export)
+    return parser
+
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    args.func(args)
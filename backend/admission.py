@@ -0,0 +1,198 @@
+"""Admission control for expensive endpoints.
+
+Each limited route gets a fixed number of concurrent slots and a bounded wait
+queue. Waiting happens on the event loop, so queued requests don't hold a
+threadpool thread. Capping expensive routes keeps threads free for login,
+status and posting, which are never queued.
+
+* per-user cap (active + queued) on a route        -> 429
+* queue full, or no slot within max_wait seconds   -> 503
+Both carry Retry-After, estimated from recent service times. Queued requests
+are admitted round-robin across users, so one user's burst can't starve others.
+
+Limits are per process; with N uvicorn workers the effective limit is N times higher.
+"""
+import asyncio
+import math
+import time
+from collections import Counter, OrderedDict, deque
+from dataclasses import dataclass
+
+from jose import JWTError, jwt
+from starlette.responses import JSONResponse
+
+from routes.auth import SECRET_KEY, ALGORITHM
+
+
+@dataclass
+class RouteLimit:
+    concurrency: int
+    max_queue: int
+    max_wait: float          # seconds a request may wait for a slot
+    per_user: int            # active + queued requests per user
+    expected_seconds: float  # initial service-time estimate for Retry-After
+
+
+class Shed(Exception):
+    def __init__(self, status_code: int, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class _RoutePool:
+    def __init__(self, limit: RouteLimit):
+        self.limit = limit
+        self.active = 0
+        self.queued = 0
+        self.waiting = OrderedDict()  # user -> deque of futures, in round-robin order
+        self.per_user = Counter()
+        self.avg_seconds = limit.expected_seconds
+        self.admitted = 0
+        self.shed = Counter()
+
+    def retry_after(self) -> int:
+        estimate = self.avg_seconds * (self.queued + 1) / self.limit.concurrency
+        return max(1, min(120, math.ceil(estimate)))
+
+    def _shed(self, status_code: int, reason: str, detail: str):
+        self.shed[reason] += 1
+        raise Shed(status_code, detail, self.retry_after())
+
+    async def acquire(self, user: str):
+        if self.per_user[user] >= self.limit.per_user:
+            self._shed(429, "per_user", "Too many concurrent requests for this endpoint. Please retry shortly.")
+
+        if self.active < self.limit.concurrency and not self.queued:
+            self.active += 1
+            self.per_user[user] += 1
+            self.admitted += 1
+            return
+
+        if self.queued >= self.limit.max_queue:
+            self._shed(503, "queue_full", "Server is busy. Please retry shortly.")
+
+        fut = asyncio.get_running_loop().create_future()
+        self.waiting.setdefault(user, deque()).append(fut)
+        self.queued += 1
+        self.per_user[user] += 1
+        try:
+            await asyncio.wait_for(fut, self.limit.max_wait)
+        except asyncio.TimeoutError:
+            # On 3.12+ wait_for can time out even though release() already
+            # handed us the slot in the same loop iteration; keep it in that case.
+            if not (fut.done() and not fut.cancelled()):
+                self._forget(user, fut)
+                self._shed(503, "timeout", "Server is busy. Please retry shortly.")
+        except asyncio.CancelledError:
+            # Client went away: give back a slot we may have just been handed
+            if fut.done() and not fut.cancelled():
+                self.release(user, None)
+            else:
+                self._forget(user, fut)
+            raise
+        self.admitted += 1
+
+    def _forget(self, user: str, fut):
+        queue = self.waiting.get(user)
+        if queue is not None and fut in queue:
+            queue.remove(fut)
+            if not queue:
+                del self.waiting[user]
+        self.queued -= 1
+        self.per_user[user] -= 1
+        if self.per_user[user] <= 0:
+            del self.per_user[user]
+
+    def release(self, user: str, elapsed):
+        if elapsed is not None:
+            self.avg_seconds = 0.8 * self.avg_seconds + 0.2 * elapsed
+        self.per_user[user] -= 1
+        if self.per_user[user] <= 0:
+            del self.per_user[user]
+
+        # Hand the slot straight to the next user in round-robin order
+        while self.waiting:
+            next_user, queue = next(iter(self.waiting.items()))
+            fut = queue.popleft()
+            if queue:
+                self.waiting.move_to_end(next_user)
+            else:
+                del self.waiting[next_user]
+            if fut.done():  # timed out / cancelled; _forget adjusts the counts
+                continue
+            self.queued -= 1
+            fut.set_result(None)
+            return
+        self.active -= 1
+
+    def stats(self) -> dict:
+        return {
+            "concurrency": self.limit.concurrency,
+            "active": self.active,
+            "queued": self.queued,
+            "max_queue": self.limit.max_queue,
+            "admitted": self.admitted,
+            "shed": dict(self.shed),
+            "avg_seconds": round(self.avg_seconds, 3),
+        }
+
+
+class AdmissionController:
+    def __init__(self, limits: dict):
+        self.pools = {path: _RoutePool(limit) for path, limit in limits.items()}
+
+    def pool_for(self, method: str, path: str):
+        if method != "POST":
+            return None
+        return self.pools.get(path.rstrip("/") or "/")
+
+    def stats(self) -> dict:
+        return {path: pool.stats() for path, pool in self.pools.items()}
+
+
+def _user_key(scope) -> str:
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                try:
+                    sub = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM]).get("sub")
+                    if sub:
+                        return f"user:{sub}"
+                except JWTError:
+                    pass
+            break
+    client = scope.get("client")
+    return f"ip:{client[0]}" if client else "anonymous"
+
+
+class AdmissionMiddleware:
+    """Pure ASGI middleware; add it inside CORS so shed responses still get CORS headers."""
+
+    def __init__(self, app, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        pool = self.controller.pool_for(scope.get("method", ""), scope.get("path", "")) if scope["type"] == "http" else None
+        if pool is None:
+            return await self.app(scope, receive, send)
+
+        user = _user_key(scope)
+        try:
+            await pool.acquire(user)
+        except Shed as e:
+            response = JSONResponse(
+                {"detail": e.detail},
+                status_code=e.status_code,
+                headers={"Retry-After": str(e.retry_after)},
+            )
+            return await response(scope, receive, send)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            pool.release(user, time.perf_counter() - started)
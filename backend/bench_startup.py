@@ -0,0 +1,100 @@
+"""Cold-start benchmark: python bench_startup.py [--runs 5] [--path /health]
+
+For each run, in a fresh interpreter:
+  * import time of `main` (the app module, as uvicorn loads it)
+  * time from spawning uvicorn until it answers its first request
+  * latency of that first request to --path, and of a second (warm) one
+Prints the median of each over all runs. Each run gets a fresh SQLite DB in a temp
+dir, so AUTO_MIGRATE never touches the real database.
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import requests
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _bench_env(tmpdir: str) -> dict:
+    return {**os.environ, "DATABASE_URL": f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"}
+
+
+def measure_import(env: dict):
+    code = "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)"
+    out = subprocess.run([sys.executable, "-c", code], cwd=HERE, env=env, capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def measure_server(path: str, env: dict, timeout: float = 30.0):
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=HERE,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            if time.perf_counter() - started > timeout:
+                raise RuntimeError("server did not start in time")
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.05).close()
+                break
+            except OSError:
+                time.sleep(0.01)
+
+        t = time.perf_counter()
+        requests.get(base + path, timeout=timeout)
+        first = time.perf_counter() - t
+        ready = time.perf_counter() - started
+
+        t = time.perf_counter()
+        requests.get(base + path, timeout=timeout)
+        warm = time.perf_counter() - t
+        return ready, first, warm
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--path", default="/health")
+    args = parser.parse_args()
+
+    imports, readies, firsts, warms = [], [], [], []
+    for _ in range(args.runs):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            env = _bench_env(tmpdir)
+            imports.append(measure_import(env))
+            ready, first, warm = measure_server(args.path, env)
+        readies.append(ready)
+        firsts.append(first)
+        warms.append(warm)
+
+    ms = lambda values: f"{statistics.median(values) * 1000:8.1f} ms"
+    print(f"runs: {args.runs}   path: {args.path}   AUTO_MIGRATE={os.getenv('AUTO_MIGRATE', '1')}")
+    print(f"import main          {ms(imports)}")
+    print(f"spawn -> first reply {ms(readies)}")
+    print(f"first request        {ms(firsts)}")
+    print(f"warm request         {ms(warms)}")
+
+
+if __name__ == "__main__":
+    main()
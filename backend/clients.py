@@ -0,0 +1,21 @@
+"""Lazily constructed SDK clients.
+
+The Gemini SDK and requests-oauthlib are only imported the first time they are
+needed, so workers that never generate content or talk to Twitter don't pay
+their import cost at startup.
+"""
+from functools import lru_cache
+
+from config import GEMINI_API_KEY, TWITTER_API_KEY, TWITTER_API_SECRET
+
+
+@lru_cache(maxsize=1)
+def get_gemini_client():
+    from google import genai
+    return genai.Client(api_key=GEMINI_API_KEY)
+
+
+def twitter_oauth_session(**kwargs):
+    """Build an OAuth1Session signed with the app's consumer key/secret."""
+    from requests_oauthlib import OAuth1Session
+    return OAuth1Session(TWITTER_API_KEY, client_secret=TWITTER_API_SECRET, **kwargs)
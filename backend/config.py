@@ -6,6 +6,9 @@ load_dotenv()
 # LinkedIn
 CLIENT_ID = os.getenv("LINKEDIN_CLIENT_ID", "")
 CLIENT_SECRET = os.getenv("LINKEDIN_CLIENT_SECRET", "")
+# Add r_member_social (a LinkedIn partner permission) to let metrics_sync.py read
+# likes/comments; without it LinkedIn metrics batches get 403 and are skipped.
+LINKEDIN_SCOPES = os.getenv("LINKEDIN_SCOPES", "openid profile w_member_social")
 REDIRECT_URI = os.getenv("REDIRECT_URI", "https://social-media-autoposting.onrender.com/linkedin/callback")
 TWITTER_CALLBACK_URL = os.getenv("TWITTER_CALLBACK_URL", "https://social-media-autoposting.onrender.com/twitter/callback")
 
@@ -14,4 +17,19 @@ GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
 
 # Twitter/X
 TWITTER_API_KEY = os.getenv("TWITTER_API_KEY", "")
-TWITTER_API_SECRET = os.getenv("TWITTER_API_SECRET", "")
\ No newline at end of file
+TWITTER_API_SECRET = os.getenv("TWITTER_API_SECRET", "")
+
+# Engagement metrics sync: seconds between cycles of `python metrics_sync.py --loop`
+METRICS_SYNC_INTERVAL = int(os.getenv("METRICS_SYNC_INTERVAL", "300"))
+
+# Run Base.metadata.create_all on app startup. Set to 0 when the schema is managed
+# by an explicit `python migrate.py` step (faster cold starts).
+AUTO_MIGRATE = os.getenv("AUTO_MIGRATE", "1") == "1"
+
+# Serve the built frontend (frontend/dist) from this app for single-origin deploys
+SERVE_FRONTEND = os.getenv("SERVE_FRONTEND", "0") == "1"
+FRONTEND_DIST = os.getenv("FRONTEND_DIST", os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "frontend", "dist"))
+
+# Admission control: concurrent slots per process for the expensive content endpoints
+GENERATE_CONCURRENCY = int(os.getenv("GENERATE_CONCURRENCY", "8"))
+GENERATE_IMAGE_CONCURRENCY = int(os.getenv("GENERATE_IMAGE_CONCURRENCY", "2"))
@@ -0,0 +1,161 @@
+"""Structured, non-blocking logging.
+
+Request threads only enqueue records (QueueHandler); a background QueueListener
+redacts secrets, renders one JSON object per line and writes to stdout. So a slow
+stdout never stalls the event loop or a worker thread.
+
+Environment:
+  LOG_LEVEL               root level (default INFO)
+  LOG_LEVELS              per-logger overrides, e.g. "routes.linkedin=DEBUG,metrics_sync=WARNING"
+  LOG_DEBUG_SAMPLE_RATE   fraction of DEBUG records kept (default 1.0); a call can
+                          override it with extra={"sample_rate": 0.01}
+"""
+import atexit
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import re
+import sys
+import uuid
+from datetime import datetime, timezone
+
+request_id_var = contextvars.ContextVar("request_id", default=None)
+
+REDACTED = "***"
+
+# key=value, "key": "value" and 'key': 'value' forms of anything credential-like
+_SECRET_KEYS = r"(?:access_token|access_token_secret|refresh_token|id_token|oauth_token_secret|oauth_token|oauth_verifier|client_secret|password|hashed_password|api_key|code)"
+_SECRET_PATTERNS = [
+    re.compile(r"(?i)(bearer\s+)[A-Za-z0-9\-._~+/]+=*"),
+    re.compile(r"(?i)(['\"]" + _SECRET_KEYS + r"['\"]\s*:\s*['\"])[^'\"]*"),
+    re.compile(r"(?i)(\b" + _SECRET_KEYS + r"=)[^&\s,;'\"]+"),
+]
+_SECRET_FIELD = re.compile(r"(?i)token|secret|password|authorization|api_key")
+
+# LogRecord attributes that are not user-supplied `extra` fields
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "request_id", "sample_rate"}
+
+
+def redact(text: str) -> str:
+    for pattern in _SECRET_PATTERNS:
+        text = pattern.sub(lambda m: m.group(1) + REDACTED, text)
+    return text
+
+
+def _redact_value(value):
+    """Redact an `extra` value, walking into dicts and lists (e.g. a headers dict)."""
+    if isinstance(value, dict):
+        return {k: REDACTED if _SECRET_FIELD.search(str(k)) else _redact_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [_redact_value(v) for v in value]
+    if isinstance(value, (bool, int, float)) or value is None:
+        return value
+    return redact(str(value))
+
+
+class RequestContextFilter(logging.Filter):
+    """Runs in the caller's thread: stamps the request id and drops sampled-out DEBUG records."""
+
+    def __init__(self, debug_sample_rate: float = 1.0):
+        super().__init__()
+        self.debug_sample_rate = debug_sample_rate
+
+    def filter(self, record):
+        if record.levelno <= logging.DEBUG:
+            rate = getattr(record, "sample_rate", self.debug_sample_rate)
+            if rate < 1.0 and random.random() >= rate:
+                return False
+        record.request_id = request_id_var.get()
+        return True
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        # Only merge the message args here; redaction and JSON rendering happen
+        # on the listener thread.
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": redact(record.getMessage()),
+        }
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+        for key, value in vars(record).items():
+            if key in _RESERVED or key.startswith("_"):
+                continue
+            entry[key] = REDACTED if _SECRET_FIELD.search(key) else _redact_value(value)
+        if record.exc_info:
+            entry["exc"] = redact(self.formatException(record.exc_info))
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+_listener = None
+
+
+def setup_logging():
+    """Install the queue handler on the root logger. Idempotent."""
+    global _listener
+    if _listener is not None:
+        return
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(JsonFormatter())
+
+    log_queue = queue.SimpleQueue()
+    handler = _QueueHandler(log_queue)
+    handler.addFilter(RequestContextFilter(float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "1.0"))))
+
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+
+    for item in filter(None, os.getenv("LOG_LEVELS", "").split(",")):
+        name, _, level = item.partition("=")
+        logging.getLogger(name.strip()).setLevel(level.strip().upper())
+
+    _listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+
+class RequestIdMiddleware:
+    """Pure ASGI middleware: takes X-Request-ID from the client (or makes one),
+    exposes it to log records via a contextvar and echoes it on the response."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")[:64]
+                break
+        request_id = request_id or uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"x-request-id", request_id.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            request_id_var.reset(token)
@@ -1,29 +1,68 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from db import engine, Base
-from routes import linkedin, content, twitter, auth
+from db import init_db, engine
+from config import AUTO_MIGRATE, SERVE_FRONTEND, FRONTEND_DIST, GENERATE_CONCURRENCY, GENERATE_IMAGE_CONCURRENCY
+from routes import linkedin, content, twitter, auth, metrics, accounts, debug, campaigns
+from logging_setup import setup_logging, RequestIdMiddleware
+from admission import AdmissionController, AdmissionMiddleware, RouteLimit
+from timing import ServerTimingMiddleware, install_db_timing
 
-app = FastAPI()
+setup_logging()
+install_db_timing(engine)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if AUTO_MIGRATE:
+        init_db()
+    yield
+
+
+app = FastAPI(lifespan=lifespan)
+
+admission = AdmissionController({
+    "/content/generate": RouteLimit(concurrency=GENERATE_CONCURRENCY, max_queue=32, max_wait=10, per_user=3, expected_seconds=5),
+    "/content/generate-multi": RouteLimit(concurrency=GENERATE_CONCURRENCY, max_queue=32, max_wait=10, per_user=3, expected_seconds=8),
+    "/content/generate-image": RouteLimit(concurrency=GENERATE_IMAGE_CONCURRENCY, max_queue=8, max_wait=30, per_user=1, expected_seconds=60),
+    "/campaigns/import": RouteLimit(concurrency=2, max_queue=4, max_wait=30, per_user=1, expected_seconds=10),
+})
+
+# Middleware added last runs first: RequestId -> ServerTiming -> CORS -> Admission -> routes
+app.add_middleware(AdmissionMiddleware, controller=admission)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID", "Retry-After", "Server-Timing", "X-Profile-Id"],
 )
-
-Base.metadata.create_all(bind=engine)
+app.add_middleware(ServerTimingMiddleware)
+app.add_middleware(RequestIdMiddleware)
 
 app.include_router(linkedin.router)
 app.include_router(content.router)
 app.include_router(twitter.router)
 app.include_router(auth.router)
-
-@app.get("/")
-def home():
-    return {"message": "Social Media Poster v2 Running", "status": "online"}
+app.include_router(metrics.router)
+app.include_router(accounts.router)
+app.include_router(debug.router)
+app.include_router(campaigns.router)
 
 @app.get("/health")
 def health():
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+@app.get("/health/admission")
+def admission_stats():
+    return admission.stats()
+
+if SERVE_FRONTEND:
+    # Must come last: catch-all route for the SPA (also takes over "/")
+    from static_site import mount_frontend
+    mount_frontend(app, FRONTEND_DIST)
+else:
+    @app.get("/")
+    def home():
+        return {"message": "Social Media Poster v2 Running", "status": "online"}
@@ -0,0 +1,237 @@
+"""Background sync of engagement metrics for published posts.
+
+Metrics are pulled with the platforms' batch lookup endpoints (many post IDs per
+request) and stored as snapshots in `post_metric_snapshots`. Read endpoints only
+ever serve those snapshots, so dashboards never trigger upstream calls.
+
+Run it as a single dedicated process, not inside the web workers (N workers
+would multiply the upstream calls):
+
+  python metrics_sync.py           # one cycle, e.g. from cron
+  python metrics_sync.py --loop    # every METRICS_SYNC_INTERVAL seconds
+"""
+import argparse
+import logging
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from urllib.parse import quote
+
+import requests
+from sqlalchemy import func, or_
+
+from db import SessionLocal
+from models import PublishedPost, PostMetricSnapshot, LinkedInUser, TwitterUser
+from config import METRICS_SYNC_INTERVAL
+from clients import twitter_oauth_session
+
+logger = logging.getLogger(__name__)
+
+# (max post age, min time between syncs) — recent posts are refreshed more often,
+# posts older than the last tier are no longer synced.
+SYNC_TIERS = [
+    (timedelta(days=1), timedelta(minutes=15)),
+    (timedelta(days=7), timedelta(hours=1)),
+    (timedelta(days=30), timedelta(hours=6)),
+    (timedelta(days=90), timedelta(days=1)),
+]
+
+# Upstream batch limits
+LINKEDIN_BATCH_SIZE = 50   # socialActions BATCH_GET (bounded by URL length)
+TWITTER_BATCH_SIZE = 100   # GET /2/tweets?ids= accepts up to 100 ids
+
+# Upper bound on posts examined per platform per cycle, newest first
+MAX_POSTS_PER_CYCLE = 1000
+
+
+class RateLimited(Exception):
+    pass
+
+
+class AccountUnauthorized(Exception):
+    """Stored credentials can't read metrics (expired token or missing scope)."""
+
+
+def _due_filter(now: datetime):
+    clauses = []
+    for max_age, interval in SYNC_TIERS:
+        clauses.append(
+            (PublishedPost.created_at >= now - max_age)
+            & or_(
+                PublishedPost.metrics_synced_at.is_(None),
+                PublishedPost.metrics_synced_at <= now - interval,
+            )
+        )
+    return or_(*clauses)
+
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+# 🔹 LinkedIn: socialActions BATCH_GET → likes / comments
+def fetch_linkedin_metrics(access_token: str, urns: list) -> dict:
+    ids = ",".join(quote(urn, safe="") for urn in urns)
+    url = f"https://api.linkedin.com/v2/socialActions?ids=List({ids})"
+    headers = {
+        "Authorization": f"Bearer {access_token}",
+        "X-Restli-Protocol-Version": "2.0.0",
+    }
+    res = requests.get(url, headers=headers, timeout=30)
+    if res.status_code == 429:
+        raise RateLimited("linkedin")
+    if res.status_code in (401, 403):
+        # Reading socialActions needs r_member_social (see LINKEDIN_SCOPES)
+        raise AccountUnauthorized(res.status_code)
+    if res.status_code != 200:
+        logger.warning("LinkedIn socialActions batch failed", extra={"status_code": res.status_code})
+        return {}
+
+    metrics = {}
+    for urn, result in res.json().get("results", {}).items():
+        metrics[urn] = {
+            "likes": result.get("likesSummary", {}).get("totalLikes", 0),
+            "comments": result.get("commentsSummary", {}).get("aggregatedTotalComments", 0),
+            "impressions": None,
+            "reposts": None,
+        }
+    return metrics
+
+
+# 🔹 Twitter: GET /2/tweets?ids=... → public_metrics
+def fetch_twitter_metrics(account: TwitterUser, tweet_ids: list) -> dict:
+    oauth = twitter_oauth_session(
+        resource_owner_key=account.access_token,
+        resource_owner_secret=account.access_token_secret,
+    )
+    res = oauth.get(
+        "https://api.twitter.com/2/tweets",
+        params={"ids": ",".join(tweet_ids), "tweet.fields": "public_metrics"},
+        timeout=30,
+    )
+    if res.status_code == 429:
+        raise RateLimited("twitter")
+    if res.status_code in (401, 403):
+        raise AccountUnauthorized(res.status_code)
+    if res.status_code != 200:
+        logger.warning("Twitter tweets lookup failed", extra={"status_code": res.status_code})
+        return {}
+
+    metrics = {}
+    for tweet in res.json().get("data", []):
+        pm = tweet.get("public_metrics", {})
+        metrics[tweet["id"]] = {
+            "likes": pm.get("like_count", 0),
+            "comments": pm.get("reply_count", 0),
+            "impressions": pm.get("impression_count"),
+            "reposts": pm.get("retweet_count", 0) + pm.get("quote_count", 0),
+        }
+    return metrics
+
+
+def _latest_snapshots(db, post_ids: list) -> dict:
+    latest = (
+        db.query(PostMetricSnapshot.post_id, func.max(PostMetricSnapshot.captured_at).label("captured_at"))
+        .filter(PostMetricSnapshot.post_id.in_(post_ids))
+        .group_by(PostMetricSnapshot.post_id)
+        .subquery()
+    )
+    rows = (
+        db.query(PostMetricSnapshot)
+        .join(latest, (PostMetricSnapshot.post_id == latest.c.post_id)
+              & (PostMetricSnapshot.captured_at == latest.c.captured_at))
+        .all()
+    )
+    return {row.post_id: row for row in rows}
+
+
+def _store(db, posts: list, metrics: dict, now: datetime):
+    """Write a snapshot only when a post's counters changed since the last one."""
+    previous = _latest_snapshots(db, [p.id for p in posts])
+    for post in posts:
+        # Mark missing/deleted posts as synced too, so they back off like the rest
+        post.metrics_synced_at = now
+        values = metrics.get(post.external_id)
+        if values is None:
+            continue
+        last = previous.get(post.id)
+        if last and all(getattr(last, k) == v for k, v in values.items()):
+            continue
+        db.add(PostMetricSnapshot(post_id=post.id, captured_at=now, **values))
+    db.commit()
+
+
+def _sync_platform(db, platform: str, account_model, batch_size: int, fetch, now: datetime) -> int:
+    rows = (
+        db.query(PublishedPost, account_model)
+        .join(account_model, account_model.user_id == PublishedPost.user_id)
+        .filter(PublishedPost.platform == platform, _due_filter(now))
+        .order_by(PublishedPost.created_at.desc())
+        .limit(MAX_POSTS_PER_CYCLE)
+        .all()
+    )
+
+    by_account = defaultdict(list)
+    accounts = {}
+    for post, account in rows:
+        by_account[account.id].append(post)
+        accounts[account.id] = account
+
+    synced = 0
+    try:
+        for account_id, posts in by_account.items():
+            try:
+                for batch in _chunks(posts, batch_size):
+                    metrics = fetch(accounts[account_id], [p.external_id for p in batch])
+                    _store(db, batch, metrics, now)
+                    synced += len(batch)
+            except AccountUnauthorized as e:
+                # Leave the posts unsynced so they are picked up once the account is fixed
+                logger.warning(
+                    "%s account cannot read metrics, skipping", platform,
+                    extra={"account_id": account_id, "status_code": e.args[0]},
+                )
+    except RateLimited:
+        logger.warning("%s rate limited, resuming next cycle", platform)
+    return synced
+
+
+def run_once() -> dict:
+    now = datetime.utcnow()
+    db = SessionLocal()
+    try:
+        return {
+            "linkedin": _sync_platform(
+                db, "linkedin", LinkedInUser, LINKEDIN_BATCH_SIZE,
+                lambda acc, ids: fetch_linkedin_metrics(acc.access_token, ids), now,
+            ),
+            "twitter": _sync_platform(
+                db, "twitter", TwitterUser, TWITTER_BATCH_SIZE, fetch_twitter_metrics, now,
+            ),
+        }
+    finally:
+        db.close()
+
+
+def run_forever(interval: int):
+    while True:
+        try:
+            result = run_once()
+            logger.info("Metrics sync", extra={"synced": result})
+        except Exception:
+            logger.exception("Metrics sync failed")
+        time.sleep(interval)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sync engagement metrics for published posts.")
+    parser.add_argument("--loop", action="store_true", help="Keep running, one cycle every METRICS_SYNC_INTERVAL seconds")
+    args = parser.parse_args()
+
+    if args.loop:
+        from logging_setup import setup_logging
+        setup_logging()
+        run_forever(max(METRICS_SYNC_INTERVAL, 1))
+    else:
+        print(run_once())
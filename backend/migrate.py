@@ -0,0 +1,10 @@
+"""Explicit schema migration step: python migrate.py
+
+Run this once per deploy and start the app with AUTO_MIGRATE=0 to keep
+create_all off the cold-start path.
+"""
+from db import init_db
+
+if __name__ == "__main__":
+    init_db()
+    print("[INFO] Database schema is up to date.")
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
+from datetime import datetime
 from db import Base
 
 
@@ -36,3 +37,61 @@ class User(Base):
 
     linkedin_account = relationship("LinkedInUser", back_populates="user", uselist=False)
     twitter_account = relationship("TwitterUser", back_populates="user", uselist=False)
+
+
+class PublishedPost(Base):
+    __tablename__ = "published_posts"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    platform = Column(String, nullable=False)  # "linkedin" | "twitter"
+    external_id = Column(String, nullable=False)  # ugcPost URN or tweet id
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    metrics_synced_at = Column(DateTime, nullable=True)
+
+    user = relationship("User")
+    snapshots = relationship("PostMetricSnapshot", back_populates="post", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        Index("ix_published_posts_platform_external_id", "platform", "external_id", unique=True),
+        Index("ix_published_posts_platform_created_at", "platform", "created_at"),
+    )
+
+
+class PostMetricSnapshot(Base):
+    """One row per observed change in a post's engagement counters."""
+    __tablename__ = "post_metric_snapshots"
+
+    id = Column(Integer, primary_key=True)
+    post_id = Column(Integer, ForeignKey("published_posts.id", ondelete="CASCADE"), nullable=False)
+    captured_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    likes = Column(Integer, default=0, nullable=False)
+    comments = Column(Integer, default=0, nullable=False)
+    impressions = Column(Integer, nullable=True)  # not exposed for LinkedIn member posts
+    reposts = Column(Integer, nullable=True)
+
+    post = relationship("PublishedPost", back_populates="snapshots")
+
+    __table_args__ = (
+        Index("ix_post_metric_snapshots_post_captured", "post_id", "captured_at"),
+    )
+
+
+class ScheduledPost(Base):
+    __tablename__ = "scheduled_posts"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    platform = Column(String, nullable=False)  # "linkedin" | "twitter"
+    text = Column(String, nullable=False)
+    scheduled_at = Column(DateTime, nullable=False)
+    status = Column(String, default="pending", nullable=False)
+    campaign = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    user = relationship("User")
+
+    __table_args__ = (
+        Index("ix_scheduled_posts_status_scheduled_at", "status", "scheduled_at"),
+        Index("ix_scheduled_posts_user_scheduled_at", "user_id", "scheduled_at"),
+    )
@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.orm import Session, joinedload
+import hashlib
+import json
+
+from db import get_db
+from models import User
+from routes.auth import get_token_email, credentials_exception
+
+router = APIRouter(prefix="/accounts", tags=["Accounts"])
+
+
+# 🔹 Combined LinkedIn + Twitter connection status (one query, ETag-aware)
+@router.get("/status")
+def status(
+    request: Request,
+    email: str = Depends(get_token_email),
+    db: Session = Depends(get_db),
+):
+    user = (
+        db.query(User)
+        .options(joinedload(User.linkedin_account), joinedload(User.twitter_account))
+        .filter(User.email == email)
+        .first()
+    )
+    if user is None:
+        raise credentials_exception()
+
+    li = user.linkedin_account
+    tw = user.twitter_account
+    payload = {
+        "linkedin": {"connected": True, "linkedin_id": li.linkedin_id} if li else {"connected": False},
+        "twitter": {"connected": True, "screen_name": tw.screen_name} if tw else {"connected": False},
+    }
+
+    body = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode()
+    etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Authorization"}
+
+    # Weak comparison (RFC 9110 §13.1.2): proxies and compression may add W/
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -10,6 +10,7 @@ import os
 
 from db import get_db
 from models import User
+from timing import span
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
@@ -34,10 +35,12 @@ class Token(BaseModel):
     token_type: str
 
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    with span("hash"):
+        return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    with span("hash"):
+        return pwd_context.hash(password)
 
 def create_access_token(data: dict):
     to_encode = data.copy()
@@ -46,23 +49,29 @@ def create_access_token(data: dict):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    credentials_exception = HTTPException(
+def credentials_exception():
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def get_token_email(token: str = Depends(oauth2_scheme)) -> str:
+    """Validate the bearer token and return its subject without touching the DB."""
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        with span("jwt"):
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
         if email is None:
-            raise credentials_exception
+            raise credentials_exception()
     except JWTError:
-        raise credentials_exception
-    
+        raise credentials_exception()
+    return email
+
+def get_current_user(email: str = Depends(get_token_email), db: Session = Depends(get_db)):
     user = db.query(User).filter(User.email == email).first()
     if user is None:
-        raise credentials_exception
+        raise credentials_exception()
     return user
 
 @router.post("/signup", response_model=Token)
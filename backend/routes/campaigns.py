@@ -0,0 +1,186 @@
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from datetime import datetime, timezone
+from typing import Literal, Optional
+import csv
+import io
+import json
+import logging
+
+from db import get_db, SessionLocal
+from models import LinkedInUser, TwitterUser, ScheduledPost, User
+from routes.auth import get_current_user
+from routes.content import LINKEDIN_MAX_CHARS, TWEET_MAX_CHARS, tweet_length
+
+router = APIRouter(prefix="/campaigns", tags=["Campaigns"])
+logger = logging.getLogger(__name__)
+
+# Rows are committed in batches of this size; the report for a batch is only
+# streamed back once its transaction has committed.
+IMPORT_BATCH_SIZE = 500
+
+PLATFORMS = ("linkedin", "twitter")
+
+
+class RowError(Exception):
+    pass
+
+
+def _iter_rows(upload: UploadFile, fmt: str):
+    """Yield (row_number, dict) pairs, reading the upload incrementally."""
+    text = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        for number, row in enumerate(csv.DictReader(text), start=1):
+            yield number, row
+        return
+    for number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield number, RowError(f"invalid JSON: {e.msg}")
+            continue
+        yield number, row if isinstance(row, dict) else RowError("each line must be a JSON object")
+
+
+def _parse_scheduled_at(value, now: datetime) -> datetime:
+    if not value:
+        raise RowError("scheduled_at is required")
+    try:
+        when = datetime.fromisoformat(str(value).strip())
+    except ValueError:
+        raise RowError("scheduled_at must be an ISO 8601 datetime")
+    if when.tzinfo is not None:
+        when = when.astimezone(timezone.utc).replace(tzinfo=None)
+    if when <= now:
+        raise RowError("scheduled_at must be in the future")
+    return when
+
+
+def _validate(row: dict, connected: set, now: datetime):
+    text = str(row.get("text") or "").strip()
+    if not text:
+        raise RowError("text is required")
+    scheduled_at = _parse_scheduled_at(row.get("scheduled_at"), now)
+
+    platform = str(row.get("platform") or "all").strip().lower()
+    if platform == "all":
+        platforms = [p for p in PLATFORMS if p in connected]
+        if not platforms:
+            raise RowError("no connected accounts")
+    elif platform in PLATFORMS:
+        if platform not in connected:
+            raise RowError(f"{platform} account is not connected")
+        platforms = [platform]
+    else:
+        raise RowError("platform must be linkedin, twitter or all")
+
+    if "linkedin" in platforms and len(text) > LINKEDIN_MAX_CHARS:
+        raise RowError(f"text exceeds {LINKEDIN_MAX_CHARS} characters for LinkedIn")
+    if "twitter" in platforms and tweet_length(text) > TWEET_MAX_CHARS:
+        raise RowError(f"text exceeds {TWEET_MAX_CHARS} characters for Twitter")
+    return text, scheduled_at, platforms
+
+
+def _import_stream(upload: UploadFile, fmt: str, user_id: int, connected: set, campaign: Optional[str]):
+    """Validate, insert in batched transactions and stream an NDJSON per-row report."""
+    db = SessionLocal()
+    now = datetime.utcnow()
+    counts = {"imported": 0, "failed": 0, "posts": 0}
+    values, pending = [], []  # insert params / report lines for the current batch
+
+    def flush():
+        if values:
+            ids = db.scalars(
+                insert(ScheduledPost).returning(ScheduledPost.id, sort_by_parameter_order=True),
+                values,
+            ).all()
+            db.commit()
+            id_iter = iter(ids)
+            for report in pending:
+                if report["status"] == "ok":
+                    report["ids"] = [next(id_iter) for _ in report.pop("platforms")]
+        return emit(pending)
+
+    def emit(reports):
+        # Counted only once a batch is committed (or known to be rejected)
+        for report in reports:
+            if report["status"] == "ok":
+                counts["imported"] += 1
+                counts["posts"] += len(report["ids"])
+            else:
+                counts["failed"] += 1
+        lines = "".join(json.dumps(report) + "\n" for report in reports)
+        values.clear()
+        pending.clear()
+        return lines
+
+    try:
+        for number, row in _iter_rows(upload, fmt):
+            try:
+                if isinstance(row, RowError):
+                    raise row
+                text, scheduled_at, platforms = _validate(row, connected, now)
+            except RowError as e:
+                pending.append({"row": number, "status": "error", "error": str(e)})
+            else:
+                for platform in platforms:
+                    values.append({
+                        "user_id": user_id,
+                        "platform": platform,
+                        "text": text,
+                        "scheduled_at": scheduled_at,
+                        "status": "pending",
+                        "campaign": campaign,
+                        "created_at": now,
+                    })
+                pending.append({"row": number, "status": "ok", "platforms": platforms})
+
+            if len(pending) >= IMPORT_BATCH_SIZE:
+                yield flush()
+        yield flush()
+        yield json.dumps({"summary": counts}) + "\n"
+    except (UnicodeDecodeError, csv.Error) as e:
+        db.rollback()
+        # Rows validated in the uncommitted batch were never written
+        for report in pending:
+            if report["status"] == "ok":
+                report.pop("platforms")
+                report.update(status="error", error="not imported: upload could not be read past this batch")
+        yield emit(pending)
+        yield json.dumps({"error": f"could not read upload: {e}", "summary": counts}) + "\n"
+    finally:
+        db.close()
+        upload.file.close()
+        logger.info("Campaign import finished", extra={"user_id": user_id, **counts})
+
+
+# 🔹 Bulk import scheduled posts from a JSONL or CSV upload
+@router.post("/import")
+def import_campaign(
+    file: UploadFile = File(...),
+    format: Optional[Literal["jsonl", "csv"]] = Query(None),
+    campaign: Optional[str] = Form(None),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Each row needs `text` and `scheduled_at` (ISO 8601) and may set `platform`
+    (linkedin | twitter | all, default all connected accounts). The response is
+    NDJSON: one report line per row, then a summary line."""
+    fmt = format or ("csv" if (file.filename or "").lower().endswith(".csv") else "jsonl")
+
+    connected = set()
+    if db.query(LinkedInUser.id).filter(LinkedInUser.user_id == current_user.id).first():
+        connected.add("linkedin")
+    if db.query(TwitterUser.id).filter(TwitterUser.user_id == current_user.id).first():
+        connected.add("twitter")
+    if not connected:
+        raise HTTPException(status_code=400, detail="Connect LinkedIn or Twitter before importing a campaign.")
+
+    return StreamingResponse(
+        _import_stream(file, fmt, current_user.id, connected, campaign),
+        media_type="application/x-ndjson",
+    )
@@ -1,7 +1,8 @@
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from google import genai
-from config import GEMINI_API_KEY
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+from clients import get_gemini_client
+from timing import span
 import requests
 import subprocess
 import shutil
@@ -9,11 +10,13 @@ import os
 import uuid
 from urllib.parse import quote
 import random
+import logging
 import base64
+import json
+import re
 
 router = APIRouter(prefix="/content", tags=["Content"])
-
-client = genai.Client(api_key=GEMINI_API_KEY)
+logger = logging.getLogger(__name__)
 
 # 👇 CHANGE THE MODEL HERE — Options: "gemini-2.0-flash", "gemini-2.0-flash-lite", "gemini-2.5-flash", "gemini-2.5-pro"
 MODEL_NAME = "gemini-2.5-flash"
@@ -50,10 +53,11 @@ Guidelines:
 """
 
     try:
-        response = client.models.generate_content(
-            model=MODEL_NAME,
-            contents=prompt
-        )
+        with span("gemini"):
+            response = get_gemini_client().models.generate_content(
+                model=MODEL_NAME,
+                contents=prompt
+            )
         if response and response.text:
             return {"generated_text": response.text}
         else:
@@ -61,7 +65,185 @@ Guidelines:
     except HTTPException:
         raise
     except Exception as e:
-        print(f"[ERROR] Gemini API error: {e}")
+        logger.exception("Gemini API error")
+        raise HTTPException(status_code=500, detail=f"Gemini API error: {str(e)}")
+
+# 🔹 Multi-platform generation: LinkedIn post + tweet/thread + hashtags in one call
+
+LINKEDIN_MAX_CHARS = 3000
+TWEET_MAX_CHARS = 280
+TWEET_URL_LENGTH = 23  # t.co wraps every URL (and auto-linked bare domain) to this length
+MAX_THREAD_TWEETS = 10
+
+# Twitter also links bare domains like example.com. Anything domain-shaped is
+# counted, which can overcount (e.g. "node.js") but never undercounts.
+_URL_RE = re.compile(r"https?://\S+|(?<![\w@.])(?:[A-Za-z0-9-]+\.)+[A-Za-z]{2,}\b(?:/\S*)?")
+_HASHTAG_RE = re.compile(r"^#\w+$")
+
+
+class MultiPlatformRequest(BaseModel):
+    topic: str
+    tone: str = "professional"
+    length: str = "medium"
+    twitter_format: Literal["tweet", "thread"] = "tweet"
+    thread_length: int = Field(4, ge=2, le=MAX_THREAD_TWEETS)
+
+
+class PlatformVariants(BaseModel):
+    linkedin_post: str
+    tweets: List[str]
+    hashtags: List[str]
+
+
+class VariantRepair(BaseModel):
+    linkedin_post: Optional[str] = None
+    tweets: Optional[List[str]] = None
+
+
+def tweet_length(text: str) -> int:
+    """Character count as Twitter weighs it: URLs and bare domains count 23, CJK/emoji count 2."""
+    length = 0
+    for part_index, part in enumerate(_URL_RE.split(text)):
+        if part_index:
+            length += TWEET_URL_LENGTH
+        for ch in part:
+            cp = ord(ch)
+            light = cp <= 0x10FF or 0x2000 <= cp <= 0x200D or 0x2010 <= cp <= 0x201F or 0x2032 <= cp <= 0x2037
+            length += 1 if light else 2
+    return length
+
+
+def _normalize_hashtags(tags: List[str]) -> List[str]:
+    seen, result = set(), []
+    for tag in tags:
+        tag = "#" + re.sub(r"\W", "", tag.lstrip("#"))
+        if _HASHTAG_RE.match(tag) and tag.lower() not in seen:
+            seen.add(tag.lower())
+            result.append(tag)
+    return result[:5]
+
+
+def _variant_problems(variants: PlatformVariants, req: MultiPlatformRequest) -> dict:
+    problems = {}
+    if not variants.linkedin_post.strip():
+        problems["linkedin_post"] = "is empty"
+    elif len(variants.linkedin_post) > LINKEDIN_MAX_CHARS:
+        problems["linkedin_post"] = f"is {len(variants.linkedin_post)} characters, limit is {LINKEDIN_MAX_CHARS}"
+
+    expected = 1 if req.twitter_format == "tweet" else req.thread_length
+    too_long = [i + 1 for i, t in enumerate(variants.tweets) if tweet_length(t) > TWEET_MAX_CHARS]
+    if len(variants.tweets) != expected or any(not t.strip() for t in variants.tweets):
+        problems["tweets"] = f"must be exactly {expected} non-empty tweet(s), got {len(variants.tweets)}"
+    elif too_long:
+        problems["tweets"] = f"tweet(s) {too_long} exceed {TWEET_MAX_CHARS} characters"
+    return problems
+
+
+ELLIPSIS = "…"
+
+
+def _truncate_tweet(text: str) -> str:
+    # The ellipsis itself weighs 2 under Twitter's counting
+    budget = TWEET_MAX_CHARS - tweet_length(ELLIPSIS)
+    while tweet_length(text) > budget:
+        cut = text.rsplit(" ", 1)[0]
+        text = cut if cut != text else text[:-1]
+    return text.rstrip() + ELLIPSIS
+
+
+def _call_gemini_json(prompt: str, schema):
+    with span("gemini"):
+        response = get_gemini_client().models.generate_content(
+            model=MODEL_NAME,
+            contents=prompt,
+            config={"response_mime_type": "application/json", "response_schema": schema},
+        )
+    if not response or not response.text:
+        raise HTTPException(status_code=500, detail="Empty response from Gemini API")
+    if isinstance(response.parsed, schema):
+        return response.parsed
+    return schema.model_validate_json(response.text)
+
+
+@router.post("/generate-multi")
+def generate_multi_platform(req: MultiPlatformRequest):
+    twitter_spec = (
+        "a single tweet"
+        if req.twitter_format == "tweet"
+        else f"a thread of exactly {req.thread_length} tweets, numbered like 1/{req.thread_length}"
+    )
+    prompt = f"""
+You are an expert social media content writer. Write platform-specific versions of one post about the following topic.
+
+Topic: {req.topic}
+Tone: {req.tone}
+
+Return JSON with:
+- linkedin_post: a compelling LinkedIn post. Length: {req.length} (short = 50-100 words, medium = 100-200 words, long = 200-350 words). Start with a strong hook, use short paragraphs and line breaks, emojis sparingly, and end with 3-5 hashtags. At most {LINKEDIN_MAX_CHARS} characters.
+- tweets: {twitter_spec} for Twitter/X. Each tweet at most {TWEET_MAX_CHARS} characters including hashtags (URLs count as {TWEET_URL_LENGTH}). Punchy, not a trimmed copy of the LinkedIn post; at most 2 hashtags per tweet.
+- hashtags: 3-5 relevant hashtags, each starting with #.
+
+Do NOT include any markdown formatting, just plain text. Write everything as ready-to-post content.
+"""
+
+    try:
+        variants = _call_gemini_json(prompt, PlatformVariants)
+        variants.hashtags = _normalize_hashtags(variants.hashtags)
+
+        # Repair only the variants that violate their platform's constraints
+        problems = _variant_problems(variants, req)
+        repaired = sorted(problems)
+        repair_error = None
+        if problems:
+            logger.info("Repairing generated variants", extra={"variants": repaired})
+            failing = {name: getattr(variants, name) for name in problems}
+            repair_prompt = f"""
+Rewrite ONLY the following fields of a social media post so they satisfy their constraints. Keep the meaning and tone.
+
+Topic: {req.topic}
+Problems:
+{chr(10).join(f"- {name} {problem}" for name, problem in problems.items())}
+
+Current values (JSON):
+{json.dumps(failing, ensure_ascii=False)}
+
+Constraints: linkedin_post at most {LINKEDIN_MAX_CHARS} characters; tweets must be {twitter_spec}, each at most {TWEET_MAX_CHARS} characters.
+Return JSON containing only the fields listed above. Plain text, no markdown.
+"""
+            try:
+                fix = _call_gemini_json(repair_prompt, VariantRepair)
+            except Exception as e:
+                # Keep the first draft; the truncation below still makes it postable
+                logger.warning("Variant repair failed", extra={"variants": repaired}, exc_info=True)
+                repair_error = e.detail if isinstance(e, HTTPException) else str(e)
+            else:
+                for name in problems:
+                    if getattr(fix, name) is not None:
+                        setattr(variants, name, getattr(fix, name))
+
+            # Last resort so the output always fits the posting endpoints
+            remaining = _variant_problems(variants, req)
+            if "linkedin_post" in remaining and len(variants.linkedin_post) > LINKEDIN_MAX_CHARS:
+                variants.linkedin_post = variants.linkedin_post[:LINKEDIN_MAX_CHARS - 1].rstrip() + ELLIPSIS
+            if "tweets" in remaining:
+                variants.tweets = [t if tweet_length(t) <= TWEET_MAX_CHARS else _truncate_tweet(t) for t in variants.tweets if t.strip()]
+
+        unresolved = _variant_problems(variants, req)
+        if repair_error is not None:
+            unresolved["repair"] = f"failed: {repair_error}"
+        return {
+            "linkedin": {"text": variants.linkedin_post},
+            "twitter": {"format": req.twitter_format, "tweets": variants.tweets},
+            "hashtags": variants.hashtags,
+            "repaired": repaired,
+            # Anything still failing after repair (e.g. wrong thread length);
+            # empty when every variant can go straight to the posting endpoints.
+            "problems": unresolved,
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Gemini API error")
         raise HTTPException(status_code=500, detail=f"Gemini API error: {str(e)}")
 
 
@@ -69,20 +251,15 @@ Guidelines:
 def generate_image(req: ImageRequest):
     try:
         return _generate_image_impl(req)
-    except Exception as e:
-        import traceback
-        error_msg = traceback.format_exc()
-        print(f"CRITICAL ERROR in generate-image: {e}")
-        # Write to file so we can read it via tool
-        with open("last_error.txt", "w") as f:
-            f.write(error_msg)
+    except Exception:
+        logger.exception("generate-image failed")
         return {"image_url": "https://dummyimage.com/600x400/000/fff&text=Error"}
 
 def _generate_image_impl(req: ImageRequest):
 
     # Use Pollinations.ai (Free, no key required)
     # Curl works, so we mimic it or use simple requests
-    print(f"[INFO] Generating image with Pollinations.ai for prompt: {req.prompt}")
+    logger.info("Generating image with Pollinations.ai", extra={"prompt_chars": len(req.prompt)})
     encoded_prompt = quote(req.prompt)
     seed = random.randint(1, 1000000)
     image_url = f"https://image.pollinations.ai/prompt/{encoded_prompt}?seed={seed}&nologo=true"
@@ -96,8 +273,9 @@ def _generate_image_impl(req: ImageRequest):
         # We need a User-Agent that mimics a browser or the default PS one
         ps_command = f"Invoke-WebRequest -Uri '{image_url}' -OutFile '{temp_filename}' -UserAgent 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'"
         
-        print(f"[INFO] Downloading via PowerShell: {image_url}")
-        subprocess.run(["powershell", "-Command", ps_command], check=True, timeout=45)
+        logger.debug("Downloading via PowerShell")
+        with span("image_download"):
+            subprocess.run(["powershell", "-Command", ps_command], check=True, timeout=45)
         
         if os.path.exists(temp_filename):
             with open(temp_filename, "rb") as f:
@@ -108,37 +286,41 @@ def _generate_image_impl(req: ImageRequest):
             
             # Verify magic bytes (JPEG/PNG)
             if len(img_data) > 1000 and (img_data.startswith(b'\xff\xd8') or img_data.startswith(b'\x89PNG')):
-                print("[INFO] PowerShell download successful!")
-                img_base64 = base64.b64encode(img_data).decode('utf-8')
+                logger.info("PowerShell download successful")
+                with span("b64"):
+                    img_base64 = base64.b64encode(img_data).decode('utf-8')
                 return {"image_base64": f"data:image/jpeg;base64,{img_base64}"}
             else:
-                print(f"[WARNING] Downloaded content invalid or too small. First bytes: {img_data[:20]}")
+                logger.warning("Downloaded content invalid or too small", extra={"size": len(img_data)})
         else:
-            print("[WARNING] Temp file not found after PowerShell command.")
+            logger.warning("Temp file not found after PowerShell command")
 
     except Exception as ps_e:
-        print(f"[ERROR] PowerShell download failed: {ps_e}")
+        logger.warning("PowerShell download failed: %s", ps_e)
         # Clean up if exists
         if 'temp_filename' in locals() and os.path.exists(temp_filename):
             os.remove(temp_filename)
 
     # Fallback to requests (likely to fail with 530, but worth a shot if PS fails)
     try:
-        print("[INFO] Falling back to requests...")
+        logger.info("Falling back to requests")
         headers = {"User-Agent": "curl/7.68.0"} 
-        response = requests.get(image_url, headers=headers, timeout=30)
+        with span("image_download"):
+            response = requests.get(image_url, headers=headers, timeout=30)
         
         if response.status_code == 200:
-            img_base64 = base64.b64encode(response.content).decode('utf-8')
+            with span("b64"):
+                img_base64 = base64.b64encode(response.content).decode('utf-8')
             return {"image_base64": f"data:image/jpeg;base64,{img_base64}"}
         else:
-             print(f"[ERROR] Pollinations failed with status: {response.status_code}")
+             logger.warning("Pollinations failed", extra={"status_code": response.status_code})
              
              # FALLBACK to Lexica.art (Search existing AI images)
-             print(f"[INFO] Falling back to Lexica.art search for: {req.prompt}")
+             logger.info("Falling back to Lexica.art search")
              try:
                  lexica_url = f"https://lexica.art/api/v1/search?q={quote(req.prompt)}"
-                 lex_res = requests.get(lexica_url, headers=headers, timeout=30)
+                 with span("lexica"):
+                     lex_res = requests.get(lexica_url, headers=headers, timeout=30)
                  if lex_res.status_code == 200:
                      data = lex_res.json()
                      if data.get("images"):
@@ -146,16 +328,16 @@ def _generate_image_impl(req: ImageRequest):
                          best_image = data["images"][0]
                          image_src = best_image.get("src")
                          if image_src:
-                             print(f"[INFO] Found Lexica image: {image_src}")
+                             logger.info("Found Lexica image")
                              # Try to download it (to convert to base64) or return URL
                              # Lexica images are usually accessible. Let's return URL as safest fallback.
                              return {"image_url": image_src}
              except Exception as lex_e:
-                 print(f"[ERROR] Lexica fallback failed: {lex_e}")
+                 logger.warning("Lexica fallback failed: %s", lex_e)
 
              # If everything fails, return the original Pollinations URL (though it might be blocked)
              return {"image_url": image_url}
     except Exception as e:
-        print(f"[ERROR] Backend fetch failed: {e}")
+        logger.warning("Backend fetch failed: %s", e)
         return {"image_url": image_url}
 
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+from typing import Optional
+
+from timing import get_profile, profile_authorized
+
+router = APIRouter(prefix="/debug", tags=["Debug"])
+
+
+# 🔹 Fetch a folded-stack profile recorded for a request sent with X-Profile
+@router.get("/profile/{profile_id}", response_class=PlainTextResponse)
+def profile(profile_id: str, x_profile: Optional[str] = Header(None)):
+    if not profile_authorized(x_profile):
+        raise HTTPException(status_code=403, detail="Profiling is not enabled for this client.")
+    folded = get_profile(profile_id)
+    if folded is None:
+        raise HTTPException(status_code=404, detail="Profile not found or expired.")
+    return folded
@@ -4,14 +4,17 @@ from sqlalchemy.orm import Session
 from urllib.parse import quote
 from typing import Optional, List
 import requests
+import logging
 import os
 
 from db import get_db
-from models import LinkedInUser, User
-from config import CLIENT_ID, CLIENT_SECRET, REDIRECT_URI
+from models import LinkedInUser, PublishedPost, User
+from config import CLIENT_ID, CLIENT_SECRET, REDIRECT_URI, LINKEDIN_SCOPES
 from routes.auth import get_current_user
+from timing import span
 
 router = APIRouter(prefix="/linkedin", tags=["LinkedIn"])
+logger = logging.getLogger(__name__)
 
 FRONTEND_URL = os.getenv("FRONTEND_URL", "https://social-media-autoposting.vercel.app")
 
@@ -27,12 +30,11 @@ def login(current_user: User = Depends(get_current_user)):
         f"?response_type=code"
         f"&client_id={CLIENT_ID}"
         f"&redirect_uri={encoded_redirect}"
-        "&scope=openid%20profile%20w_member_social"
+        f"&scope={quote(LINKEDIN_SCOPES, safe='')}"
         f"&state={state}"
         "&prompt=login"
     )
-    print(f"[DEBUG] OAuth URL: {url}")
-    print(f"[DEBUG] REDIRECT_URI: {REDIRECT_URI}")
+    logger.debug("LinkedIn OAuth URL issued", extra={"redirect_uri": REDIRECT_URI})
     return {"auth_url": url}
 
 
@@ -40,7 +42,7 @@ def login(current_user: User = Depends(get_current_user)):
 @router.get("/callback")
 def callback(code: str, state: Optional[str] = None, db: Session = Depends(get_db)):
     try:
-        print(f"[DEBUG] Callback received with code: {code[:10]}...")
+        logger.debug("LinkedIn callback received")
         # Exchange code for access token
         token_url = "https://www.linkedin.com/oauth/v2/accessToken"
         data = {
@@ -51,9 +53,10 @@ def callback(code: str, state: Optional[str] = None, db: Session = Depends(get_d
             "client_secret": CLIENT_SECRET,
         }
 
-        res = requests.post(token_url, data=data)
+        with span("li_token"):
+            res = requests.post(token_url, data=data)
         token_data = res.json()
-        print(f"[DEBUG] Token response: {res.status_code} - {token_data}")
+        logger.info("LinkedIn token exchange", extra={"status_code": res.status_code})
 
         if "access_token" not in token_data:
             return RedirectResponse(f"{FRONTEND_URL}?linkedin=error&message=token_failed")
@@ -62,7 +65,8 @@ def callback(code: str, state: Optional[str] = None, db: Session = Depends(get_d
 
         # Get user info
         headers = {"Authorization": f"Bearer {access_token}"}
-        user_info = requests.get("https://api.linkedin.com/v2/userinfo", headers=headers).json()
+        with span("li_userinfo"):
+            user_info = requests.get("https://api.linkedin.com/v2/userinfo", headers=headers).json()
         linkedin_id = user_info.get("sub")
 
         if not linkedin_id:
@@ -129,8 +133,9 @@ def register_image_upload(access_token: str, linkedin_id: str):
         }
     }
 
-    res = requests.post(url, headers=headers, json=body)
-    print(f"[DEBUG] Register upload response: {res.status_code} - {res.text}")
+    with span("li_register"):
+        res = requests.post(url, headers=headers, json=body)
+    logger.debug("LinkedIn register upload", extra={"status_code": res.status_code})
 
     if res.status_code != 200:
         raise HTTPException(
@@ -154,8 +159,9 @@ def upload_image_binary(upload_url: str, image_bytes: bytes, access_token: str):
         "Authorization": f"Bearer {access_token}",
     }
 
-    res = requests.put(upload_url, headers=headers, data=image_bytes)
-    print(f"[DEBUG] Image upload response: {res.status_code}")
+    with span("li_upload"):
+        res = requests.put(upload_url, headers=headers, data=image_bytes)
+    logger.debug("LinkedIn image upload", extra={"status_code": res.status_code})
 
     if res.status_code not in (200, 201):
         raise HTTPException(
@@ -194,7 +200,7 @@ async def post(
         for img in images:
             if not img or not img.filename:
                 continue
-            print(f"[DEBUG] Uploading image: {img.filename} ({img.content_type})")
+            logger.debug("Uploading image", extra={"image_name": img.filename, "content_type": img.content_type})
             upload_url, asset = register_image_upload(access_token, linkedin_id)
             image_bytes = await img.read()
             upload_image_binary(upload_url, image_bytes, access_token)
@@ -224,8 +230,9 @@ async def post(
     }
 
     url = "https://api.linkedin.com/v2/ugcPosts"
-    response = requests.post(url, headers=headers, json=data)
-    print(f"[DEBUG] Post response: {response.status_code} - {response.text}")
+    with span("li_ugcpost"):
+        response = requests.post(url, headers=headers, json=data)
+    logger.info("LinkedIn post", extra={"status_code": response.status_code})
 
     if response.status_code != 201:
         raise HTTPException(
@@ -233,4 +240,10 @@ async def post(
             detail=f"LinkedIn API error: {response.text}",
         )
 
+    # Track the post so the metrics sync job can pick it up
+    post_urn = response.headers.get("x-restli-id") or response.json().get("id")
+    if post_urn:
+        db.add(PublishedPost(user_id=current_user.id, platform="linkedin", external_id=post_urn))
+        db.commit()
+
     return {"message": "Posted successfully!", "response": response.json()}
\ No newline at end of file
@@ -0,0 +1,96 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Optional
+
+from db import get_db
+from models import PublishedPost, PostMetricSnapshot, User
+from routes.auth import get_current_user
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+# Served purely from stored snapshots — the background job in metrics_sync.py
+# is the only thing that talks to LinkedIn/Twitter for metrics.
+
+
+def _snapshot_dict(s: PostMetricSnapshot):
+    return {
+        "captured_at": s.captured_at.isoformat(),
+        "likes": s.likes,
+        "comments": s.comments,
+        "impressions": s.impressions,
+        "reposts": s.reposts,
+    }
+
+
+# 🔹 Latest metrics for the user's published posts
+@router.get("/posts")
+def list_post_metrics(
+    platform: Optional[str] = None,
+    limit: int = 50,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    limit = max(1, min(limit, 200))
+    latest = (
+        db.query(PostMetricSnapshot.post_id, func.max(PostMetricSnapshot.captured_at).label("captured_at"))
+        .join(PublishedPost, PublishedPost.id == PostMetricSnapshot.post_id)
+        .filter(PublishedPost.user_id == current_user.id)
+        .group_by(PostMetricSnapshot.post_id)
+        .subquery()
+    )
+    query = (
+        db.query(PublishedPost, PostMetricSnapshot)
+        .outerjoin(latest, latest.c.post_id == PublishedPost.id)
+        .outerjoin(
+            PostMetricSnapshot,
+            (PostMetricSnapshot.post_id == latest.c.post_id)
+            & (PostMetricSnapshot.captured_at == latest.c.captured_at),
+        )
+        .filter(PublishedPost.user_id == current_user.id)
+    )
+    if platform:
+        query = query.filter(PublishedPost.platform == platform)
+
+    rows = query.order_by(PublishedPost.created_at.desc()).limit(limit).all()
+    return {
+        "posts": [
+            {
+                "id": post.id,
+                "platform": post.platform,
+                "external_id": post.external_id,
+                "created_at": post.created_at.isoformat(),
+                "metrics": _snapshot_dict(snap) if snap else None,
+            }
+            for post, snap in rows
+        ]
+    }
+
+
+# 🔹 Snapshot time series for one post
+@router.get("/posts/{post_id}")
+def post_metric_history(
+    post_id: int,
+    since: Optional[datetime] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    post = db.query(PublishedPost).filter(
+        PublishedPost.id == post_id, PublishedPost.user_id == current_user.id
+    ).first()
+    if not post:
+        raise HTTPException(status_code=404, detail="Post not found.")
+
+    query = db.query(PostMetricSnapshot).filter(PostMetricSnapshot.post_id == post.id)
+    if since:
+        query = query.filter(PostMetricSnapshot.captured_at >= since)
+    snapshots = query.order_by(PostMetricSnapshot.captured_at).all()
+
+    return {
+        "id": post.id,
+        "platform": post.platform,
+        "external_id": post.external_id,
+        "last_synced_at": post.metrics_synced_at.isoformat() if post.metrics_synced_at else None,
+        "snapshots": [_snapshot_dict(s) for s in snapshots],
+    }
@@ -3,17 +3,20 @@ from fastapi.responses import RedirectResponse
 from sqlalchemy.orm import Session
 from urllib.parse import quote
 from typing import Optional, List
-from requests_oauthlib import OAuth1Session
 import requests
+import base64
+import logging
 import os
 import json
 
 from db import get_db
-from models import TwitterUser
-from config import TWITTER_API_KEY, TWITTER_API_SECRET
+from models import TwitterUser, PublishedPost
+from clients import twitter_oauth_session
 from routes.auth import get_current_user, User
+from timing import span
 
 router = APIRouter(prefix="/twitter", tags=["Twitter"])
+logger = logging.getLogger(__name__)
 
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5173")
 TWITTER_CALLBACK_URL = os.getenv("TWITTER_CALLBACK_URL", "")
@@ -27,13 +30,10 @@ _oauth_tokens = {}
 @router.get("/login")
 def login(current_user: User = Depends(get_current_user)):
     try:
-        oauth = OAuth1Session(
-            TWITTER_API_KEY,
-            client_secret=TWITTER_API_SECRET,
-            callback_uri=TWITTER_CALLBACK_URL,
-        )
+        oauth = twitter_oauth_session(callback_uri=TWITTER_CALLBACK_URL)
         url = "https://api.twitter.com/oauth/request_token"
-        response = oauth.fetch_request_token(url)
+        with span("tw_request_token"):
+            response = oauth.fetch_request_token(url)
 
         oauth_token = response.get("oauth_token")
         oauth_token_secret = response.get("oauth_token_secret")
@@ -45,11 +45,11 @@ def login(current_user: User = Depends(get_current_user)):
         }
 
         auth_url = f"https://api.twitter.com/oauth/authorize?oauth_token={oauth_token}"
-        print(f"[DEBUG] Twitter auth URL: {auth_url}")
+        logger.debug("Twitter auth URL issued")
         return {"auth_url": auth_url}
 
     except Exception as e:
-        print(f"[ERROR] Twitter login: {e}")
+        logger.exception("Twitter login failed")
         raise HTTPException(status_code=500, detail=f"Twitter login failed: {str(e)}")
 
 
@@ -64,23 +64,22 @@ def callback(oauth_token: str, oauth_verifier: str, db: Session = Depends(get_db
         oauth_token_secret = token_data["secret"]
         user_id = token_data["user_id"]
 
-        oauth = OAuth1Session(
-            TWITTER_API_KEY,
-            client_secret=TWITTER_API_SECRET,
+        oauth = twitter_oauth_session(
             resource_owner_key=oauth_token,
             resource_owner_secret=oauth_token_secret,
             verifier=oauth_verifier,
         )
 
         url = "https://api.twitter.com/oauth/access_token"
-        tokens = oauth.fetch_access_token(url)
+        with span("tw_access_token"):
+            tokens = oauth.fetch_access_token(url)
 
         access_token = tokens["oauth_token"]
         access_token_secret = tokens["oauth_token_secret"]
         twitter_user_id = tokens["user_id"]
         screen_name = tokens.get("screen_name", "")
 
-        print(f"[DEBUG] Twitter connected for user {user_id}: @{screen_name} (ID: {twitter_user_id})")
+        logger.info("Twitter connected", extra={"user_id": user_id, "screen_name": screen_name})
 
         # Save or update linked account for THIS user
         existing = db.query(TwitterUser).filter(TwitterUser.user_id == user_id).first()
@@ -103,7 +102,7 @@ def callback(oauth_token: str, oauth_verifier: str, db: Session = Depends(get_db
         return RedirectResponse(f"{FRONTEND_URL}?twitter=success")
 
     except Exception as e:
-        print(f"[ERROR] Twitter callback: {e}")
+        logger.exception("Twitter callback failed")
         return RedirectResponse(f"{FRONTEND_URL}?twitter=error&message={quote(str(e))}")
 
 
@@ -131,15 +130,13 @@ def disconnect(db: Session = Depends(get_db), current_user: User = Depends(get_c
 def upload_media(oauth_session, image_bytes: bytes) -> str:
     """Upload image to Twitter and return media_id_string."""
     url = "https://upload.twitter.com/1.1/media/upload.json"
-    files = {"media_data": [None, __import__("base64").b64encode(image_bytes).decode("utf-8")]}
+    with span("b64"):
+        media_data = base64.b64encode(image_bytes).decode("utf-8")
 
-    # Use multipart upload
-    response = oauth_session.post(
-        url,
-        data={"media_data": __import__("base64").b64encode(image_bytes).decode("utf-8")},
-    )
+    with span("tw_media"):
+        response = oauth_session.post(url, data={"media_data": media_data})
 
-    print(f"[DEBUG] Media upload: {response.status_code}")
+    logger.debug("Twitter media upload", extra={"status_code": response.status_code})
     if response.status_code != 200:
         error_detail = response.text
         if "does not have any credits" in error_detail or response.status_code == 403:
@@ -151,7 +148,6 @@ def upload_media(oauth_session, image_bytes: bytes) -> str:
 
     data = response.json()
     media_id = data["media_id_string"]
-    print(f"[DEBUG] Media ID: {media_id}")
     return media_id
 
 
@@ -160,6 +156,7 @@ def upload_media(oauth_session, image_bytes: bytes) -> str:
 async def post(
     text: str = Form(...),
     images: Optional[List[UploadFile]] = File(None),
+    reply_to: Optional[str] = Form(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -167,15 +164,16 @@ async def post(
     if not user:
         raise HTTPException(status_code=404, detail="No Twitter account connected. Please connect first.")
 
-    oauth = OAuth1Session(
-        TWITTER_API_KEY,
-        client_secret=TWITTER_API_SECRET,
+    oauth = twitter_oauth_session(
         resource_owner_key=user.access_token,
         resource_owner_secret=user.access_token_secret,
     )
 
     # Build tweet payload
     tweet_payload = {"text": text}
+    if reply_to:
+        # Chain thread tweets (e.g. from /content/generate-multi) onto the previous one
+        tweet_payload["reply"] = {"in_reply_to_tweet_id": reply_to}
 
     # Upload images if provided (support multiple)
     if images:
@@ -190,13 +188,20 @@ async def post(
 
     # Post tweet via v2 API
     url = "https://api.twitter.com/2/tweets"
-    response = oauth.post(url, json=tweet_payload)
+    with span("tw_tweet"):
+        response = oauth.post(url, json=tweet_payload)
 
-    print(f"[DEBUG] Tweet response: {response.status_code} - {response.text}")
+    logger.info("Twitter post", extra={"status_code": response.status_code})
 
     if response.status_code not in [200, 201]:
         error_data = response.json()
         error_msg = error_data.get("detail", error_data.get("title", response.text))
         raise HTTPException(status_code=400, detail=f"Tweet failed: {error_msg}")
 
-    return {"message": "Posted to Twitter/X successfully!"}
+    # Track the tweet so the metrics sync job can pick it up
+    tweet_id = response.json().get("data", {}).get("id")
+    if tweet_id:
+        db.add(PublishedPost(user_id=current_user.id, platform="twitter", external_id=tweet_id))
+        db.commit()
+
+    return {"message": "Posted to Twitter/X successfully!", "id": tweet_id}
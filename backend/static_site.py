@@ -0,0 +1,168 @@
+"""Optional single-origin mode: serve the built frontend (frontend/dist) from FastAPI.
+
+* SPA fallback — unknown non-asset paths get index.html so client-side routes work.
+* Content-hashed bundles (assets/index-<hash>.js) are cached forever (`immutable`);
+  index.html is always revalidated.
+* `.br` / `.gz` siblings are picked by Accept-Encoding, so no response is
+  compressed per request. Generate them at build time:
+
+      npm run build && python backend/static_site.py frontend/dist
+
+  If they are missing, the app compresses at startup as a fallback (slow with
+  several workers). Brotli is used only if the optional `brotli` package is installed.
+* Paths under the prefix of any registered API route never fall back to
+  index.html, so a mistyped API call gets a 404 instead of the app shell.
+"""
+import gzip
+import logging
+import mimetypes
+import os
+import re
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import FileResponse
+
+logger = logging.getLogger(__name__)
+
+try:
+    from fastapi.routing import iter_route_contexts
+except ImportError:  # older FastAPI: app.routes already lists every route
+    iter_route_contexts = iter
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+COMPRESSIBLE = {".js", ".css", ".html", ".svg", ".json", ".txt", ".map", ".xml", ".webmanifest"}
+MIN_COMPRESS_SIZE = 1024
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+# Vite names bundles <name>-<8+ char hash>.<ext>
+HASHED_ASSET = re.compile(r"-[A-Za-z0-9_-]{8,}\.[a-z0-9]+$")
+
+
+def _is_fresh(path: str, target: str) -> bool:
+    return os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(path)
+
+
+def _write_sibling(path: str, suffix: str, compress):
+    target = path + suffix
+    if _is_fresh(path, target):
+        return
+    with open(path, "rb") as f:
+        data = compress(f.read())
+    tmp = f"{target}.{os.getpid()}.tmp"  # workers may compress concurrently
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, target)
+
+
+def _compressible_files(dist_dir: str):
+    for root, _, files in os.walk(dist_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            if os.path.splitext(name)[1] in COMPRESSIBLE and os.path.getsize(path) >= MIN_COMPRESS_SIZE:
+                yield path
+
+
+def _is_precompressed(dist_dir: str) -> bool:
+    for path in _compressible_files(dist_dir):
+        if not _is_fresh(path, path + ".gz") or (brotli is not None and not _is_fresh(path, path + ".br")):
+            return False
+    return True
+
+
+def precompress(dist_dir: str):
+    """Create .gz (and .br when available) next to every compressible file."""
+    for path in _compressible_files(dist_dir):
+        try:
+            _write_sibling(path, ".gz", lambda data: gzip.compress(data, compresslevel=9, mtime=0))
+            if brotli is not None:
+                _write_sibling(path, ".br", lambda data: brotli.compress(data, quality=11))
+        except OSError as e:
+            # Read-only deploys can precompress at build time instead
+            logger.warning("Could not precompress %s: %s", path, e)
+
+
+def _accepted_encodings(header: str) -> set:
+    accepted = set()
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(token.strip().lower())
+    return accepted
+
+
+def _file_response(path: str, rel_path: str, request: Request) -> FileResponse:
+    media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    is_hashed = rel_path.startswith("assets/") and HASHED_ASSET.search(rel_path)
+    headers = {"Cache-Control": IMMUTABLE if is_hashed else REVALIDATE}
+
+    if os.path.splitext(path)[1] in COMPRESSIBLE:
+        headers["Vary"] = "Accept-Encoding"
+        accepted = _accepted_encodings(request.headers.get("accept-encoding", ""))
+        for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+            if encoding in accepted and os.path.isfile(path + suffix):
+                headers["Content-Encoding"] = encoding
+                return FileResponse(path + suffix, media_type=media_type, headers=headers)
+
+    return FileResponse(path, media_type=media_type, headers=headers)
+
+
+def _route_prefixes(app: FastAPI) -> set:
+    """First path segments of the routes registered so far (auth, linkedin, health, ...)."""
+    prefixes = set()
+    for route in iter_route_contexts(app.routes):
+        first = (getattr(route, "path", None) or "").lstrip("/").split("/", 1)[0]
+        if first and not first.startswith("{"):
+            prefixes.add(first)
+    return prefixes
+
+
+def mount_frontend(app: FastAPI, dist_dir: str):
+    """Register a catch-all GET route serving dist_dir. Call after all API routers."""
+    dist_dir = os.path.realpath(dist_dir)
+    index_path = os.path.join(dist_dir, "index.html")
+    if not os.path.isfile(index_path):
+        raise RuntimeError(f"Frontend build not found at {dist_dir} (run `npm run build` first)")
+
+    if not _is_precompressed(dist_dir):
+        logger.warning("Compressing %s at startup; run `python static_site.py <dist>` at build time instead", dist_dir)
+        precompress(dist_dir)
+
+    api_prefixes = _route_prefixes(app)
+
+    @app.api_route("/{full_path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+    def frontend(full_path: str, request: Request):
+        path = os.path.realpath(os.path.join(dist_dir, full_path))
+        if path.startswith(dist_dir + os.sep) and os.path.isfile(path):
+            return _file_response(path, full_path, request)
+
+        # Missing files under assets/ (or anything with an extension) and unknown
+        # API paths are real 404s, everything else is a client-side route.
+        if (
+            full_path.startswith("assets/")
+            or os.path.splitext(full_path)[1]
+            or full_path.split("/", 1)[0] in api_prefixes
+        ):
+            raise HTTPException(status_code=404, detail="Not Found")
+        return _file_response(index_path, "index.html", request)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from config import FRONTEND_DIST
+
+    parser = argparse.ArgumentParser(description="Precompress a frontend build (.gz, and .br if brotli is installed).")
+    parser.add_argument("dist", nargs="?", default=FRONTEND_DIST)
+    precompress(parser.parse_args().dist)
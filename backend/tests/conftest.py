@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# The app modules import each other as top-level modules (db, models, routes.*)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def sqlite_session_factory(tmp_path):
+    """Sessionmaker for a fresh SQLite DB with every table; modules patch their own SessionLocal with it."""
+    from db import Base
+    import models  # noqa: F401 — registers the tables on Base.metadata
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
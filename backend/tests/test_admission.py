@@ -0,0 +1,186 @@
+import asyncio
+
+import pytest
+
+import admission
+from admission import RouteLimit, Shed, _RoutePool
+
+
+def make_pool(concurrency=1, max_queue=4, max_wait=5.0, per_user=3):
+    return _RoutePool(RouteLimit(concurrency, max_queue, max_wait, per_user, expected_seconds=1))
+
+
+def assert_idle(pool):
+    assert pool.active == 0
+    assert pool.queued == 0
+    assert not pool.waiting
+    assert not pool.per_user
+
+
+def test_admit_and_release():
+    async def run():
+        pool = make_pool()
+        await pool.acquire("a")
+        assert pool.active == 1
+        pool.release("a", 0.1)
+        assert_idle(pool)
+
+    asyncio.run(run())
+
+
+def test_release_hands_slot_to_waiter():
+    async def run():
+        pool = make_pool()
+        await pool.acquire("a")
+        waiter = asyncio.ensure_future(pool.acquire("b"))
+        await asyncio.sleep(0)
+        assert pool.queued == 1
+
+        pool.release("a", 0.1)
+        await waiter
+        assert pool.active == 1
+        assert pool.queued == 0
+        assert pool.admitted == 2
+
+        pool.release("b", 0.1)
+        assert_idle(pool)
+
+    asyncio.run(run())
+
+
+def test_waiters_admitted_round_robin_by_user():
+    async def run():
+        pool = make_pool()
+        await pool.acquire("holder")
+        order = []
+
+        async def request(user):
+            await pool.acquire(user)
+            order.append(user)
+
+        tasks = [asyncio.ensure_future(request(u)) for u in ("a", "a", "b")]
+        await asyncio.sleep(0)
+        for user in ("holder", "a", "b"):
+            pool.release(user, 0.1)
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+        pool.release("a", 0.1)
+
+        assert order == ["a", "b", "a"]
+        assert_idle(pool)
+
+    asyncio.run(run())
+
+
+def test_per_user_cap_sheds_429():
+    async def run():
+        pool = make_pool(concurrency=2, per_user=1)
+        await pool.acquire("a")
+        with pytest.raises(Shed) as exc:
+            await pool.acquire("a")
+        assert exc.value.status_code == 429
+        assert exc.value.retry_after >= 1
+        assert pool.shed["per_user"] == 1
+        pool.release("a", 0.1)
+        assert_idle(pool)
+
+    asyncio.run(run())
+
+
+def test_full_queue_sheds_503():
+    async def run():
+        pool = make_pool(max_queue=1)
+        await pool.acquire("a")
+        waiter = asyncio.ensure_future(pool.acquire("b"))
+        await asyncio.sleep(0)
+        with pytest.raises(Shed) as exc:
+            await pool.acquire("c")
+        assert exc.value.status_code == 503
+        assert pool.shed["queue_full"] == 1
+
+        pool.release("a", 0.1)
+        await waiter
+        pool.release("b", 0.1)
+        assert_idle(pool)
+
+    asyncio.run(run())
+
+
+def test_wait_timeout_sheds_503_and_restores_counts():
+    async def run():
+        pool = make_pool(max_wait=0.01)
+        await pool.acquire("a")
+        with pytest.raises(Shed) as exc:
+            await pool.acquire("b")
+        assert exc.value.status_code == 503
+        assert pool.shed["timeout"] == 1
+        assert pool.queued == 0
+        assert "b" not in pool.per_user
+
+        pool.release("a", 0.1)
+        assert_idle(pool)
+
+    asyncio.run(run())
+
+
+def test_handoff_racing_timeout_keeps_slot(monkeypatch):
+    # Python 3.12+ can raise TimeoutError from wait_for even when the future
+    # already has its result; simulate that deterministically.
+    async def racing_wait_for(fut, timeout):
+        pool.release("a", None)
+        assert fut.done()
+        raise asyncio.TimeoutError
+
+    pool = make_pool()
+    monkeypatch.setattr(admission.asyncio, "wait_for", racing_wait_for)
+
+    async def run():
+        await pool.acquire("a")
+        await pool.acquire("b")  # must be admitted, not shed
+        assert pool.active == 1
+        assert pool.queued == 0
+        assert not pool.shed
+        pool.release("b", 0.1)
+        assert_idle(pool)
+
+    asyncio.run(run())
+
+
+def test_cancel_while_waiting_restores_counts():
+    async def run():
+        pool = make_pool()
+        await pool.acquire("a")
+        waiter = asyncio.ensure_future(pool.acquire("b"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert pool.queued == 0
+        assert "b" not in pool.per_user
+
+        pool.release("a", 0.1)
+        assert_idle(pool)
+
+    asyncio.run(run())
+
+
+def test_cancel_after_handoff_releases_slot():
+    async def run():
+        pool = make_pool()
+        await pool.acquire("a")
+        waiter = asyncio.ensure_future(pool.acquire("b"))
+        await asyncio.sleep(0)
+        pool.release("a", 0.1)  # slot handed to b ...
+        waiter.cancel()         # ... but b goes away before resuming
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            pass
+        else:
+            # Python 3.11's wait_for prefers the result over the cancellation,
+            # so the request is admitted and releases normally.
+            assert pool.active == 1
+            pool.release("b", 0.1)
+        assert_idle(pool)
+
+    asyncio.run(run())
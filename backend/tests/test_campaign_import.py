@@ -0,0 +1,49 @@
+import io
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from models import ScheduledPost
+from routes import campaigns
+
+
+@pytest.fixture
+def session_factory(sqlite_session_factory, monkeypatch):
+    monkeypatch.setattr(campaigns, "SessionLocal", sqlite_session_factory)
+    return sqlite_session_factory
+
+
+def run_import(data: bytes, fmt="jsonl"):
+    upload = SimpleNamespace(file=io.BytesIO(data))
+    out = "".join(campaigns._import_stream(upload, fmt, 1, {"twitter"}, None))
+    return [json.loads(line) for line in out.splitlines()]
+
+
+def row(i):
+    return json.dumps({"text": f"post {i}", "scheduled_at": "2099-01-01T00:00:00Z"})
+
+
+def test_import_reports_every_row(session_factory):
+    data = "\n".join([row(1), "not json", row(3)]).encode()
+    lines = run_import(data)
+    assert [l.get("status") for l in lines[:-1]] == ["ok", "error", "ok"]
+    assert lines[-1]["summary"] == {"imported": 2, "failed": 1, "posts": 2}
+    assert session_factory().query(ScheduledPost).count() == 2
+
+
+def test_unreadable_upload_does_not_count_rolled_back_rows(session_factory):
+    valid = 600
+    data = "\n".join(row(i) for i in range(valid)).encode() + b"\n\xff\xfe broken\n"
+    lines = run_import(data)
+
+    summary = lines[-1]
+    assert "error" in summary
+    stored = session_factory().query(ScheduledPost).count()
+    assert stored == campaigns.IMPORT_BATCH_SIZE
+    assert summary["summary"]["imported"] == stored
+
+    reports = lines[:-1]
+    assert [r["row"] for r in reports] == sorted(r["row"] for r in reports)
+    assert sum(r["status"] == "ok" for r in reports) == stored
+    assert summary["summary"]["failed"] == sum(r["status"] == "error" for r in reports)
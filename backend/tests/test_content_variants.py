@@ -0,0 +1,84 @@
+import json
+from types import SimpleNamespace
+
+import routes.content as content
+from routes.content import (
+    MultiPlatformRequest,
+    PlatformVariants,
+    TWEET_MAX_CHARS,
+    _truncate_tweet,
+    _variant_problems,
+    tweet_length,
+)
+
+
+def test_tweet_length_plain_text():
+    assert tweet_length("hello world") == 11
+
+
+def test_tweet_length_counts_urls_as_23():
+    assert tweet_length("see https://example.com/a/very/long/path/that/goes/on") == len("see ") + 23
+
+
+def test_tweet_length_counts_bare_domains_as_23():
+    assert tweet_length("go to ab.io now") == len("go to ") + 23 + len(" now")
+    assert tweet_length("mail me@ab.io") == len("mail me@ab.io")  # emails are not links
+
+
+def test_tweet_length_weighs_cjk_and_emoji_double():
+    assert tweet_length("日本") == 4
+    assert tweet_length("😀") == 2
+    assert tweet_length("…") == 2
+    assert tweet_length("–") == 1  # U+2013 is in a single-weight range
+
+
+def test_truncate_tweet_fits_limit():
+    for text in ("word " * 100, "x" * 400, "日本語 " * 100):
+        truncated = _truncate_tweet(text)
+        assert tweet_length(truncated) <= TWEET_MAX_CHARS
+        assert truncated.endswith("…")
+
+
+def _variants(linkedin="A post", tweets=("A tweet",)):
+    return PlatformVariants(linkedin_post=linkedin, tweets=list(tweets), hashtags=["#a"])
+
+
+def test_variant_problems_valid():
+    assert _variant_problems(_variants(), MultiPlatformRequest(topic="t")) == {}
+
+
+def test_variant_problems_linkedin_too_long_or_empty():
+    req = MultiPlatformRequest(topic="t")
+    assert "linkedin_post" in _variant_problems(_variants(linkedin="x" * 3001), req)
+    assert "linkedin_post" in _variant_problems(_variants(linkedin="  "), req)
+
+
+def test_variant_problems_tweet_too_long():
+    problems = _variant_problems(_variants(tweets=["x" * 281]), MultiPlatformRequest(topic="t"))
+    assert "exceed" in problems["tweets"]
+
+
+def test_variant_problems_wrong_thread_length():
+    req = MultiPlatformRequest(topic="t", twitter_format="thread", thread_length=3)
+    assert "exactly 3" in _variant_problems(_variants(tweets=["1/3", "2/3"]), req)["tweets"]
+    assert _variant_problems(_variants(tweets=["1/3", "2/3", "3/3"]), req) == {}
+
+
+class _StubModels:
+    def __init__(self, texts):
+        self.texts = list(texts)
+
+    def generate_content(self, **kwargs):
+        return SimpleNamespace(text=self.texts.pop(0), parsed=None)
+
+
+def test_failed_repair_keeps_variants(monkeypatch):
+    first = json.dumps({"linkedin_post": "A post", "tweets": ["word " * 60], "hashtags": ["#a"]})
+    stub = SimpleNamespace(models=_StubModels([first, ""]))  # empty repair response
+    monkeypatch.setattr(content, "get_gemini_client", lambda: stub)
+
+    result = content.generate_multi_platform(MultiPlatformRequest(topic="t"))
+
+    assert result["linkedin"]["text"] == "A post"
+    assert tweet_length(result["twitter"]["tweets"][0]) <= TWEET_MAX_CHARS
+    assert result["problems"] == {"repair": "failed: Empty response from Gemini API"}
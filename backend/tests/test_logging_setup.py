@@ -0,0 +1,23 @@
+import json
+import logging
+
+from logging_setup import JsonFormatter
+
+
+def _format(**extra):
+    record = logging.LogRecord("test", logging.INFO, __file__, 0, "hello", None, None)
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return json.loads(JsonFormatter().format(record))
+
+
+def test_redacts_secret_keys_and_values():
+    entry = _format(access_token="abc", url="https://x/cb?code=abc&state=1")
+    assert entry["access_token"] == "***"
+    assert entry["url"] == "https://x/cb?code=***&state=1"
+
+
+def test_redacts_nested_values():
+    entry = _format(headers={"Authorization": "Bearer QQQ", "Accept": "*/*"}, calls=[{"note": "Bearer ZZZ"}, 3])
+    assert entry["headers"] == {"Authorization": "***", "Accept": "*/*"}
+    assert entry["calls"] == [{"note": "Bearer ***"}, 3]
@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import metrics_sync
+from models import LinkedInUser, PostMetricSnapshot, PublishedPost, TwitterUser, User
+
+
+@pytest.fixture
+def session_factory(sqlite_session_factory, monkeypatch):
+    factory = sqlite_session_factory
+    monkeypatch.setattr(metrics_sync, "SessionLocal", factory)
+
+    db = factory()
+    db.add(User(id=1, email="a@example.com"))
+    db.add(TwitterUser(user_id=1, twitter_id="t1", access_token="a", access_token_secret="b"))
+    db.add(LinkedInUser(user_id=1, linkedin_id="l1", access_token="c"))
+    now = datetime.utcnow()
+    for i in range(150):
+        db.add(PublishedPost(user_id=1, platform="twitter", external_id=str(i), created_at=now - timedelta(hours=i)))
+    db.add(PublishedPost(user_id=1, platform="linkedin", external_id="urn:li:share:1", created_at=now))
+    db.commit()
+    db.close()
+    return factory
+
+
+def test_batches_and_writes_snapshots_only_on_change(session_factory, monkeypatch):
+    calls = []
+
+    def fake_twitter(account, ids):
+        calls.append(len(ids))
+        return {i: {"likes": 1, "comments": 0, "impressions": 5, "reposts": 0} for i in ids}
+
+    monkeypatch.setattr(metrics_sync, "fetch_twitter_metrics", fake_twitter)
+    monkeypatch.setattr(metrics_sync, "fetch_linkedin_metrics", lambda token, ids: {})
+
+    assert metrics_sync.run_once()["twitter"] == 150
+    assert calls == [100, 50]
+
+    # Nothing is due right after a sync
+    assert metrics_sync.run_once()["twitter"] == 0
+    db = session_factory()
+    assert db.query(PostMetricSnapshot).count() == 150
+
+
+def test_unauthorized_account_leaves_posts_unsynced(session_factory, monkeypatch):
+    def forbidden(token, ids):
+        raise metrics_sync.AccountUnauthorized(403)
+
+    monkeypatch.setattr(metrics_sync, "fetch_linkedin_metrics", forbidden)
+    monkeypatch.setattr(metrics_sync, "fetch_twitter_metrics", lambda account, ids: {})
+
+    result = metrics_sync.run_once()
+    assert result["linkedin"] == 0
+    assert result["twitter"] == 150
+
+    db = session_factory()
+    post = db.query(PublishedPost).filter(PublishedPost.platform == "linkedin").one()
+    assert post.metrics_synced_at is None
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from static_site import mount_frontend
+
+
+def _app(tmp_path):
+    (tmp_path / "index.html").write_text("<html>app</html>")
+    app = FastAPI()
+    router = APIRouter(prefix="/things")
+
+    @router.get("/list")
+    def list_things():
+        return []
+
+    app.include_router(router)
+    mount_frontend(app, str(tmp_path))
+    return TestClient(app)
+
+
+def test_client_routes_fall_back_to_index(tmp_path):
+    response = _app(tmp_path).get("/dashboard")
+    assert response.status_code == 200
+    assert response.text == "<html>app</html>"
+
+
+def test_unknown_paths_under_router_prefixes_are_404(tmp_path):
+    client = _app(tmp_path)
+    assert client.get("/things/list").json() == []
+    assert client.get("/things/missing").status_code == 404
+    assert client.get("/assets/missing.js").status_code == 404
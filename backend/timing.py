@@ -0,0 +1,191 @@
+"""Per-request latency breakdown.
+
+`span("name")` times a section of the current request. SQL statements are timed
+automatically (install_db_timing). Totals per span name go out in a
+`Server-Timing` response header, e.g.
+
+    Server-Timing: db;dur=3.1;desc="4 queries", li_register;dur=412.0, li_upload;dur=903.7, total;dur=1402.5
+
+Opt-in sampling profiler: when PROFILE_TOKEN is set and a request carries
+`X-Profile: <PROFILE_TOKEN>`, the threads serving that request are sampled.
+The result is kept as folded stacks (flamegraph.pl / speedscope format). The
+response gets `X-Profile-Id`, and the profile is fetched from
+GET /debug/profile/{id} with the same header.
+"""
+import contextvars
+import hmac
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL_MS", "5")) / 1000
+MAX_STORED_PROFILES = 32
+
+_current = contextvars.ContextVar("request_timings", default=None)
+
+
+class RequestTimings:
+    def __init__(self, profiler=None):
+        self.started = time.perf_counter()
+        self.totals = OrderedDict()  # name -> [seconds, count]
+        self.lock = threading.Lock()
+        self.profiler = profiler
+
+    def add(self, name: str, seconds: float):
+        with self.lock:
+            entry = self.totals.setdefault(name, [0.0, 0])
+            entry[0] += seconds
+            entry[1] += 1
+        if self.profiler is not None:
+            self.profiler.track_current_thread()
+
+    def header(self) -> str:
+        parts = []
+        with self.lock:
+            for name, (seconds, count) in self.totals.items():
+                part = f"{name};dur={seconds * 1000:.1f}"
+                if count > 1:
+                    part += f';desc="{count} {"queries" if name == "db" else "calls"}"'
+                parts.append(part)
+        parts.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.1f}")
+        return ", ".join(parts)
+
+
+@contextmanager
+def span(name: str):
+    """Time a block and attribute it to `name` on the current request (no-op outside one)."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - start)
+
+
+def install_db_timing(engine):
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("_timing_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        start = conn.info["_timing_start"].pop()
+        timings = _current.get()
+        if timings is not None:
+            timings.add("db", time.perf_counter() - start)
+
+
+# 🔹 Sampling profiler
+
+_profiles = OrderedDict()
+_profiles_lock = threading.Lock()
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Samples the stacks of the threads that have done work for one request.
+
+    The event-loop thread is registered on start. Worker threads register
+    themselves the first time they hit a span or a DB query, which covers sync
+    endpoints and dependencies running in the threadpool.
+    """
+
+    def __init__(self, interval: float = PROFILE_INTERVAL):
+        self.interval = interval
+        self.threads = {threading.get_ident()}
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def track_current_thread(self):
+        self.threads.add(threading.get_ident())
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self) -> str:
+        self._stop.set()
+        self._thread.join()
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common())
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for ident in list(self.threads):
+                frame = frames.get(ident)
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                if stack:
+                    self.samples[";".join(reversed(stack))] += 1
+
+
+def get_profile(profile_id: str):
+    with _profiles_lock:
+        return _profiles.get(profile_id)
+
+
+def _store_profile(profile: str) -> str:
+    profile_id = uuid.uuid4().hex
+    with _profiles_lock:
+        _profiles[profile_id] = profile
+        while len(_profiles) > MAX_STORED_PROFILES:
+            _profiles.popitem(last=False)
+    return profile_id
+
+
+def profile_authorized(header_value) -> bool:
+    return bool(PROFILE_TOKEN) and header_value is not None and hmac.compare_digest(header_value, PROFILE_TOKEN)
+
+
+class ServerTimingMiddleware:
+    """Pure ASGI middleware that collects spans and emits the Server-Timing header."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        profiler = None
+        for name, value in scope["headers"]:
+            if name == b"x-profile" and profile_authorized(value.decode("latin-1")):
+                profiler = SamplingProfiler()
+                profiler.start()
+                break
+
+        timings = RequestTimings(profiler)
+        token = _current.set(timings)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", timings.header().encode("latin-1")))
+                if profiler is not None:
+                    profile_id = _store_profile(profiler.stop())
+                    headers.append((b"x-profile-id", profile_id.encode("latin-1")))
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            if profiler is not None:
+                profiler.stop()  # no-op if the response already stopped it
@@ -349,8 +349,7 @@ function Dashboard() {
         const params = new URLSearchParams(window.location.search);
         if (params.get("linkedin") === "success") { showStatus("✅ LinkedIn connected!", "success"); window.history.replaceState({}, "", "/dashboard"); }
         else if (params.get("linkedin") === "error") { showStatus("❌ LinkedIn: " + (params.get("message") || "Failed"), "error"); window.history.replaceState({}, "", "/dashboard"); }
-        axios.get(`${API}/linkedin/status`, { headers }).then(res => setLinkedinConnected(res.data.connected)).catch(() => { });
-        axios.get(`${API}/twitter/status`, { headers }).then(res => { setTwitterConnected(res.data.connected); if (res.data.screen_name) setTwitterScreenName(res.data.screen_name); }).catch(() => { });
+        axios.get(`${API}/accounts/status`, { headers }).then(res => { setLinkedinConnected(res.data.linkedin.connected); setTwitterConnected(res.data.twitter.connected); if (res.data.twitter.screen_name) setTwitterScreenName(res.data.twitter.screen_name); }).catch(() => { });
     }, [navigate]);
 
     useEffect(() => { setCharCount(generatedText.length); }, [generatedText]);